@@ -7,6 +7,12 @@ from flask import Flask, render_template, request, redirect, url_for, jsonify, s
 from flask_session import Session
 from datetime import datetime,timedelta
 import json
+import zlib
+import base64
+import hashlib
+import gridfs
+import msgspec
+from cachelib import FileSystemCache
 
 
 from time import sleep
@@ -35,11 +41,15 @@ github_events = {
 MONGO_URI = os.getenv('MONGO_URI')
 client = MongoClient(MONGO_URI)  
 db = client['dashboard']  
+archive_fs = gridfs.GridFS(db, collection='IBM_archive')
 
 
 # FLASK APP ---------------------
 app = Flask(__name__)
 
+# Response cache is kept on disk so it is shared by the web workers, entries are invalidated by each repo's last_update
+cache = FileSystemCache(os.getenv('CACHE_DIR', '/tmp/dashboard_cache'), threshold=1000, default_timeout=3600)
+
 
 
 # Global Variables --->
@@ -57,6 +67,13 @@ def get_start_date():
 
     return one_year_back
 
+def get_archive_date():
+
+    # Activity older than this is moved to cold storage (defaults to the 365 day window)
+    # Truncated to midnight so the archive pass and the API default range share the same cutoff
+    horizon = int(os.getenv('ARCHIVE_HORIZON_DAYS', 365))
+    return (datetime.today() - timedelta(days=horizon)).replace(hour=0, minute=0, second=0, microsecond=0)
+
 
 def get_commit_details_from_SHA(repo_full_name, sha):
 
@@ -259,6 +276,9 @@ def get_pr_details(repo_full_name, pr_number):
                 "merged": data["merged"],
                 "url": data["html_url"],
                 "date": data['created_at'],
+                "updated_at": data.get('updated_at'),
+                "closed_at": data.get('closed_at'),
+                "merged_at": data.get('merged_at'),
                 "requested_reviewers": [reviewer["login"] for reviewer in data["requested_reviewers"]],
                 "assigned_by": data['assignee']['login'] if data.get('assignee') else None,
                 "assigned_to": [user['login'] for user in data.get('assignees', [])],
@@ -279,6 +299,65 @@ def get_pr_details(repo_full_name, pr_number):
 
 
 
+# CONTRIBUTOR FUNCTIONS ------------------------------>
+
+def get_user_aliases(mappings):
+
+    # ASSUMED SCHEMA for IBM_user_mappings documents (not read anywhere else yet):
+    #   {'login': <tracked login>, 'aliases': [<other login / commit author name / commit email>, ...]}
+    # Without it, pushes by a tracked author made under another identity are not attributed.
+    user_aliases = {}
+
+    for mapping in mappings:
+        login = mapping.get('login')
+        aliases = mapping.get('aliases')
+
+        if not login or not isinstance(aliases, list):
+            print(f"Skipping user mapping {mapping.get('_id')}: expected 'login' and 'aliases' fields",flush=True)
+            continue
+
+        user_aliases.setdefault(login, []).extend(aliases)
+
+    return user_aliases
+
+def get_contributor_index(contributors, user_aliases):
+
+    # alias --> tracked login  (logins map to themselves)
+    index = {login: login for login in contributors}
+
+    for login in set(contributors) & user_aliases.keys():
+        for alias in user_aliases[login]:
+            index.setdefault(alias, login)
+
+    return index
+
+def get_commit_author(commit, contributors):
+
+    # Same identities as is_tracked_push --> GitHub login, then git author name / email
+    author = commit.get('author') or commit.get('committer') or {}
+    git_author = (commit.get('commit') or {}).get('author') or {}
+
+    for key in (author.get('login'), git_author.get('name'), git_author.get('email')):
+        if key in contributors:
+            return contributors[key]
+
+    return None
+
+def is_tracked_push(event, contributors):
+
+    if event['actor']['login'] in contributors:
+        return True
+
+    # Push payload only carries git author name / email for each commit
+    for commit in event['payload'].get('commits', []):
+        author = commit.get('author') or {}
+
+        if author.get('name') in contributors or author.get('email') in contributors:
+            return True
+
+    return False
+
+
 # UPDATE FUNCTIONS ------------------------------>
 
 def update_repo_details(full_repo, contributors, last_snapshot, start_date):
@@ -324,14 +403,6 @@ def update_repo_details(full_repo, contributors, last_snapshot, start_date):
                 event_date = datetime.strptime(event['created_at'], "%Y-%m-%dT%H:%M:%SZ")
                 username = event['actor']['login']
 
-                # Initialize new user
-                if username not in new_updates:
-                    new_updates[username] = {
-                        'commits': [],
-                        'new_issues': [],
-                        'new_prs': []
-                        }
-
                 # Invalid Event
                 if (event['type'] not in github_events):
                     print("Invalid -- ", event['type'])
@@ -348,66 +419,86 @@ def update_repo_details(full_repo, contributors, last_snapshot, start_date):
                     valid_date = False
                     break
 
+                # Untracked users --> skip before any follow-up fetch (pushes may carry tracked authors)
+                if event['type'] == 'PushEvent':
+                    if not is_tracked_push(event, contributors):
+                        continue
+                elif username not in contributors:
+                    continue
+
+                # Initialize new user
+                login = contributors.get(username)
+                if login and login not in new_updates:
+                    new_updates[login] = {
+                        'commits': [],
+                        'new_issues': [],
+                        'new_prs': [],
+                        'issues': {}
+                        }
+
                 match event['type']:
                     case 'IssuesEvent':
                         new, (issue_no, data) = handle_issue_event(event, username)
                         print(f"issue Update -- {issue_no}")
 
                         if new:
-                            new_updates[username]['new_issues'] += [data]
+                            new_updates[login]['new_issues'] += [data]
 
                         else:
                             # Assign the latest data
-                            if issue_no and (issue_no not in new_updates[username]):
-                                new_updates[username][issue_no] = data
+                            if issue_no and (issue_no not in new_updates[login]['issues']):
+                                new_updates[login]['issues'][issue_no] = data
 
                     case 'PullRequestEvent':
                         new, data = handle_pull_request_event(event, full_repo, username)
 
                         if new:
-                            new_updates[username]['new_prs'] += [data]
+                            new_updates[login]['new_prs'] += [data]
                         
                         else:
                             pr_no, data = data
 
-                            if pr_no not in new_updates[username]:
-                                new_updates[username][pr_no] = {'pr_details': None, 'commits': [], 'comments': []}
+                            if pr_no not in new_updates[login]:
+                                new_updates[login][pr_no] = {'pr_details': None, 'commits': [], 'comments': []}
 
-                            new_updates[username][pr_no]['pr_details'] = data
+                            new_updates[login][pr_no]['pr_details'] = data
 
                     case 'PullRequestReviewEvent':
                         pr_no,comments = handle_pull_request_review_event(event, username)
                         pr_details = get_pr_details(event['repo']['name'], event['payload']['pull_request']['number'])
 
-                        if pr_no not in new_updates[username]:
-                            new_updates[username][pr_no] = {'pr_details': None, 'commits': [], 'comments': []}
+                        if pr_no not in new_updates[login]:
+                            new_updates[login][pr_no] = {'pr_details': None, 'commits': [], 'comments': []}
                         
-                        new_updates[username][pr_no]['comments'] += comments
+                        new_updates[login][pr_no]['comments'] += comments
 
                         if pr_details:
-                            new_updates[username][pr_no]['pr_details'] = pr_details
+                            new_updates[login][pr_no]['pr_details'] = pr_details
 
                     case 'PushEvent':
                         pr_no,commits = handle_push_event(event, full_repo)
                         print('Push Event',pr_no,'commits->',len(commits))
 
+                        pr_details = None
+
                         for commit in commits:
-                            
-                            commit_data = get_commit_details_from_SHA(full_repo, commit['sha'])
 
-                            if commit['author']:
-                                commitor = commit['author']['login']
-                            else:
-                                commitor = commit['committer']['login']
+                            # Commit author can differ from the actor who pushed
+                            commitor = get_commit_author(commit, contributors)
+
+                            if not commitor:
+                                continue
 
                             if commitor not in new_updates:
                                 new_updates[commitor] = {
                                     'commits': [],
                                     'new_issues': [],
-                                    'new_prs': []
+                                    'new_prs': [],
+                                    'issues': {}
                                     }
 
                             if not pr_no:
+                                commit_data = get_commit_details_from_SHA(full_repo, commit['sha'])
                                 new_updates[commitor]['commits'] += [commit_data]
                                 print("Global Commit")
                                 
@@ -418,7 +509,9 @@ def update_repo_details(full_repo, contributors, last_snapshot, start_date):
                                 new_updates[commitor][pr_no]['commits'] += [commit]
                                 print(f"PR Commit - {commitor}")
 
-                                pr_details = get_pr_details(full_repo, pr_no)
+                                # Same PR for every commit in the push --> fetch once
+                                if not pr_details:
+                                    pr_details = get_pr_details(full_repo, pr_no)
                                 if pr_details:
                                     new_updates[commitor][pr_no]['pr_details'] = pr_details
 
@@ -446,7 +539,7 @@ def update_repo_details(full_repo, contributors, last_snapshot, start_date):
 
     for username in new_updates:
 
-        # Check if valid username
+        # Check if valid username (should already be filtered while reading events)
         if username not in contributors:
             continue
 
@@ -465,38 +558,42 @@ def update_repo_details(full_repo, contributors, last_snapshot, start_date):
         repo_details['issues'] += new_updates[username]['new_issues']
 
 
+        issue_updates = new_updates[username]['issues']
+
         del new_updates[username]['commits']
         del new_updates[username]['new_prs']
         del new_updates[username]['new_issues']
+        del new_updates[username]['issues']
 
 
         # Update issues
         for idx,issue in enumerate(repo_details['issues']):
             issue_no = issue['number']
 
-            if issue_no in new_updates[username]:
-                repo_details['issues'][idx] = new_updates[username][issue_no]
-                del new_updates[username][issue_no]
+            if issue_no in issue_updates:
+                repo_details['issues'][idx] = issue_updates[issue_no]
+                del issue_updates[issue_no]
+
+        # Remaining issues are archived (or untracked so far) --> the event carries the full issue, restore it as hot
+        repo_details['issues'] += list(issue_updates.values())
         
         # Update PRs
         for idx,pr in enumerate(repo_details['pull_requests']):
 
             if pr['pr_number'] in new_updates[username]:
-                
-                pr_changes = new_updates[username][pr['pr_number']]
+                apply_pr_changes(repo_details['pull_requests'][idx], new_updates[username][pr['pr_number']])
+                del new_updates[username][pr['pr_number']]
 
+        # Remaining PRs archived --> restore the archived copy with the new changes applied
+        if new_updates[username]:
+            archived = load_archived_activity(username, full_repo, pr_numbers=list(new_updates[username]))
+            archived_prs = archived.get(username, {}).get(full_repo, {}).get('pull_requests', [])
 
-                # If new detail changes
-                if pr_changes.get('pr_details', None):
-                    repo_details['pull_requests'][idx]['pr_details'] = pr_changes['pr_details']
-                
-                if pr_changes.get('commits', None):
-                    repo_details['pull_requests'][idx]['commits'] = pr_changes['commits']
-                
-                if pr_changes.get('comments', None):
-                    repo_details['pull_requests'][idx]['comments'] += pr_changes['comments']
-            
-                del new_updates[username][pr['pr_number']]
+            for pr in archived_prs:
+                if pr['pr_number'] in new_updates[username]:
+                    apply_pr_changes(pr, new_updates[username][pr['pr_number']])
+                    repo_details['pull_requests'].append(pr)
+                    del new_updates[username][pr['pr_number']]
 
         # If anything remains, it is a new pull request with comments --> So append it directly
         for pr_no in new_updates[username]:
@@ -519,6 +616,18 @@ def update_repo_details(full_repo, contributors, last_snapshot, start_date):
 
     return True
 
+def apply_pr_changes(pr, pr_changes):
+
+    # If new detail changes
+    if pr_changes.get('pr_details', None):
+        pr['pr_details'] = pr_changes['pr_details']
+    
+    if pr_changes.get('commits', None):
+        pr['commits'] = pr_changes['commits']
+    
+    if pr_changes.get('comments', None):
+        pr['comments'] += pr_changes['comments']
+
 def handle_issue_event(event, username):
 
     issue = event['payload']['issue']        
@@ -549,6 +658,9 @@ def handle_pull_request_event(event, full_repo, username):
             "merged": data["merged"],
             "url": data["html_url"],
             "date": data['created_at'],
+            "updated_at": data.get('updated_at'),
+            "closed_at": data.get('closed_at'),
+            "merged_at": data.get('merged_at'),
             "requested_reviewers": [reviewer["login"] for reviewer in data["requested_reviewers"]],
             "assigned_by": data['assignee']['login'] if data.get('assignee') else None,
             "assigned_to": [user['login'] for user in data.get('assignees', [])],
@@ -668,6 +780,353 @@ def handle_push_event(event, full_repo):
     return None,[]
 
 
+# ARCHIVE FUNCTIONS ------------------------------>
+
+def parse_github_date(value):
+
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+    except (TypeError, ValueError):
+        return None
+
+def get_commit_date(commit):
+
+    # Commit details carry a top level date, raw /pulls/{n}/commits objects nest it under commit.committer
+    return commit.get('date') or ((commit.get('commit') or {}).get('committer') or {}).get('date')
+
+def get_activity_date(kind, item):
+
+    # Latest date at which the given commit / pull request / issue saw activity
+    if kind == 'commits':
+        dates = [get_commit_date(item)]
+    elif kind == 'issues':
+        dates = [item.get('updated_at'), item.get('created_at')]
+    else:
+        pr_details = item.get('pr_details') or {}
+        dates = [pr_details.get(key) for key in ('date', 'updated_at', 'closed_at', 'merged_at')]
+        dates += [get_commit_date(commit) for commit in item.get('commits', []) if commit]
+        dates += [comment.get('date') for comment in item.get('comments', []) if comment]
+
+    dates = [date for date in map(parse_github_date, dates) if date]
+    return max(dates) if dates else None
+
+def is_open(kind, item):
+
+    if kind == 'issues':
+        return item.get('state') == 'open'
+    if kind == 'pull_requests':
+        return (item.get('pr_details') or {}).get('state') == 'open'
+    return False
+
+def archive_old_activity(archive_date):
+
+    data_collection = db['IBM_github_data']
+    archive_collection = db['IBM_archive_index']
+    repo_names = [repo['repo_name'] for repo in db['IBM_repositories'].find({}, {'repo_name': 1})]
+
+    archive_collection.create_index([('login', 1), ('repo_name', 1), ('from_date', 1), ('to_date', 1)])
+
+    # Only the activity lists are needed
+    projection = {'user_info.login': 1}
+    for repo_name in repo_names:
+        for kind in ('commits', 'pull_requests', 'issues'):
+            projection[f"{repo_name}.{kind}"] = 1
+
+    for result in data_collection.find({}, projection):
+        username = result['user_info']['login']
+
+        for full_repo in repo_names:
+            repo_details = result.get(full_repo, None)
+
+            if not repo_details:
+                continue
+
+            # Best effort --> a bad document must not stop the rest of the pass
+            try:
+                archive_repo_activity(username, full_repo, repo_details, archive_date)
+            except Exception as e:
+                print(f"Error archiving {username} <-> {full_repo}: {e}", flush=True)
+
+def archive_repo_activity(username, full_repo, repo_details, archive_date):
+
+    data_collection = db['IBM_github_data']
+    archive_collection = db['IBM_archive_index']
+
+    archived = {}
+    activity_dates = []
+
+    # Split every activity list into hot (kept) and cold (archived) items, open issues / PRs always stay hot
+    for kind in ('commits', 'pull_requests', 'issues'):
+        hot, cold = [], []
+
+        for item in repo_details.get(kind, []):
+            date = get_activity_date(kind, item) if item else None
+
+            if date and date < archive_date and not is_open(kind, item):
+                cold.append(item)
+                activity_dates.append(date)
+            else:
+                hot.append(item)
+
+        if cold:
+            archived[kind] = cold
+            repo_details[kind] = hot
+
+    if not archived:
+        return
+
+    # Store compressed msgpack blob in GridFS and index it for historical queries
+    blob = zlib.compress(msgspec.msgpack.encode(archived))
+    file_id = archive_fs.put(blob, filename=f"{username}/{full_repo}")
+
+    archive_collection.insert_one({
+        'login': username,
+        'repo_name': full_repo,
+        'file_id': file_id,
+        'from_date': min(activity_dates),
+        'to_date': max(activity_dates),
+        'counts': {kind: len(items) for kind, items in archived.items()},
+        'pr_numbers': [pr['pr_number'] for pr in archived.get('pull_requests', [])],
+        'archived_at': datetime.today()
+    })
+
+    # Only the projected lists are loaded --> set them one by one to leave the rest of the repo document intact
+    data_collection.update_one(
+        {'user_info.login': username},
+        {'$set': {f"{full_repo}.{kind}": repo_details[kind] for kind in archived}}
+        )
+
+    print(f"Archived {username} <-> {full_repo} -- {sum(len(items) for items in archived.values())} items", flush=True)
+
+def load_archived_activity(username=None, full_repo=None, start_date=None, end_date=None, pr_numbers=None):
+
+    archive_collection = db['IBM_archive_index']
+
+    query = {}
+    if pr_numbers:
+        query['pr_numbers'] = {'$in': pr_numbers}
+    if username:
+        query['login'] = username
+    if full_repo:
+        query['repo_name'] = full_repo
+    if start_date:
+        query['to_date'] = {'$gte': start_date}
+    if end_date:
+        query['from_date'] = {'$lte': end_date}
+
+    archived = {}
+
+    # Oldest write first --> a copy archived again after a restore overrides the stale one
+    for entry in archive_collection.find(query).sort([('archived_at', 1), ('_id', 1)]):
+        blob = archive_fs.get(entry['file_id']).read()
+        data = msgspec.msgpack.decode(zlib.decompress(blob))
+
+        user_details = archived.setdefault(entry['login'], {})
+        repo_details = user_details.setdefault(entry['repo_name'], {'commits': [], 'pull_requests': [], 'issues': []})
+        for kind, items in data.items():
+            repo_details[kind] += items
+
+    # A restored item can be archived again later --> keep only its latest copy (entries are sorted by write time)
+    for user_details in archived.values():
+        for repo_details in user_details.values():
+            repo_details['pull_requests'] = dedupe_activity('pull_requests', repo_details['pull_requests'])
+            repo_details['issues'] = dedupe_activity('issues', repo_details['issues'])
+
+    return archived
+
+def dedupe_activity(kind, items, existing=()):
+
+    # Drop issues / PRs already present in <existing>, later copies in <items> win over earlier ones
+    key = 'number' if kind == 'issues' else 'pr_number'
+    seen = {item.get(key) for item in existing if item}
+
+    latest = {}
+    for item in items:
+        if item and item.get(key) not in seen:
+            latest[item.get(key)] = item
+
+    return list(latest.values()) + [item for item in items if not item]
+
+
+# API FUNCTIONS ------------------------------>
+
+ACTIVITY_KINDS = ('commits', 'pull_requests', 'issues')
+
+def parse_api_date(value):
+
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%d")
+
+def get_item_key(item):
+
+    # Keyset used for ordering (newest first) and cursors --> stable even if new items arrive between pages
+    return [item['date'] or '', item['login'], item['repo_name'], item['type'], str(item['id'])]
+
+def encode_cursor(item):
+    return base64.urlsafe_b64encode(json.dumps(get_item_key(item)).encode()).decode()
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+
+    key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    if not isinstance(key, list) or len(key) != 5 or not all(isinstance(part, str) for part in key):
+        raise ValueError('Invalid cursor')
+    return key
+
+def get_repo_versions(repo_names=None):
+
+    repo_collection = db['IBM_repositories']
+    query = {'repo_name': {'$in': repo_names}} if repo_names else {}
+
+    return {
+        repo['repo_name']: str(repo.get('last_update'))
+        for repo in repo_collection.find(query, {'repo_name': 1, 'last_update': 1})
+    }
+
+def collect_activity(username, full_repo, repo_names, kinds, start_date, end_date, include_archive):
+
+    data_collection = db['IBM_github_data']
+
+    # Only fetch the requested activity lists
+    projection = {'user_info.login': 1}
+    for repo_name in repo_names:
+        for kind in kinds:
+            projection[f"{repo_name}.{kind}"] = 1
+
+    if username:
+        results = data_collection.find({'user_info.login': username}, projection)
+    else:
+        results = data_collection.find({full_repo: {'$exists': True}}, projection)
+
+    activity = {}
+    for result in results:
+        activity[result['user_info']['login']] = {repo_name: result[repo_name] for repo_name in repo_names if result.get(repo_name)}
+
+    # Caller explicitly asked for a range past the hot window --> merge in cold storage
+    if include_archive:
+        archived = load_archived_activity(username, full_repo, start_date, end_date)
+
+        for login, user_details in archived.items():
+            for repo_name, repo_details in user_details.items():
+                if repo_name not in repo_names:
+                    continue
+
+                hot = activity.setdefault(login, {}).setdefault(repo_name, {})
+                for kind in kinds:
+                    cold = repo_details[kind]
+
+                    # Restored issues / PRs live in both tiers --> the hot copy is the latest
+                    if kind != 'commits':
+                        cold = dedupe_activity(kind, cold, hot.get(kind, []))
+
+                    hot[kind] = hot.get(kind, []) + cold
+
+    items = []
+    for login, user_details in activity.items():
+        for repo_name, repo_details in user_details.items():
+            for kind in kinds:
+                for item in repo_details.get(kind, []):
+                    if not item:
+                        continue
+
+                    date = get_activity_date(kind, item)
+                    if (start_date and (not date or date < start_date)) or (end_date and (not date or date > end_date)):
+                        continue
+
+                    if kind == 'commits':
+                        item_id = item.get('sha')
+                    elif kind == 'issues':
+                        item_id = item.get('number')
+                    else:
+                        item_id = item.get('pr_number')
+
+                    items.append({
+                        'login': login,
+                        'repo_name': repo_name,
+                        'type': kind,
+                        'id': item_id,
+                        'date': date.strftime("%Y-%m-%dT%H:%M:%SZ") if date else None,
+                        'data': item
+                    })
+
+    items.sort(key=get_item_key, reverse=True)
+    return items
+
+def activity_response(username=None, full_repo=None):
+
+    try:
+        start_date = parse_api_date(request.args.get('since'))
+        end_date = parse_api_date(request.args.get('until'))
+        cursor = decode_cursor(request.args.get('cursor'))
+        limit = int(request.args.get('limit', 50))
+    except (ValueError, TypeError, UnicodeDecodeError):
+        return jsonify({'error': 'Invalid since / until / cursor / limit'}), 400
+
+    if limit < 1:
+        return jsonify({'error': 'limit must be at least 1'}), 400
+    limit = min(limit, 500)
+
+    # Default window is the hot data, cold storage is only read when an earlier since is given
+    archive_date = get_archive_date()
+    include_archive = bool(start_date) and start_date < archive_date
+    start_date = start_date or archive_date
+
+    if end_date:
+        end_date += timedelta(days=1) - timedelta(seconds=1)
+
+    fields = request.args.get('fields')
+    kinds = list(dict.fromkeys(kind for kind in fields.split(',') if kind in ACTIVITY_KINDS)) if fields else list(ACTIVITY_KINDS)
+    if not kinds:
+        return jsonify({'error': f"fields must be any of {', '.join(ACTIVITY_KINDS)}"}), 400
+
+    full_repo = full_repo or request.args.get('repo')
+    versions = get_repo_versions([full_repo] if full_repo else None)
+    if not versions:
+        return jsonify({'error': 'Repository not found'}), 404
+
+    # ETag is derived from each repo's last_update --> unchanged data answers 304 without touching user documents
+    scope = [username, full_repo, kinds, str(start_date), str(end_date)]
+    cache_key = 'activity:' + hashlib.sha1(json.dumps(scope).encode()).hexdigest()
+    version = hashlib.sha1(json.dumps(versions, sort_keys=True).encode()).hexdigest()
+    etag = hashlib.sha1(f"{cache_key}:{version}:{cursor}:{limit}".encode()).hexdigest()
+
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+
+    # One entry per scope, overwritten when last_update moves --> no stale copies pile up on disk
+    cached = cache.get(cache_key)
+    if cached and cached['version'] == version:
+        items = cached['items']
+    else:
+        items = collect_activity(username, full_repo, list(versions), kinds, start_date, end_date, include_archive)
+        cache.set(cache_key, {'version': version, 'items': items})
+
+    if cursor:
+        items = [item for item in items if get_item_key(item) < cursor]
+
+    page = items[:limit]
+    next_cursor = encode_cursor(page[-1]) if len(items) > limit else None
+
+    response = jsonify({'items': page, 'count': len(page), 'next_cursor': next_cursor})
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+# API ROUTES ------------------------------>
+
+@app.route('/api/users/<login>/activity')
+def user_activity(login):
+    return activity_response(username=login)
+
+@app.route('/api/repos/<owner>/<repo>/activity')
+def repo_activity(owner, repo):
+    return activity_response(full_repo=f"{owner}/{repo}")
+
 
 def cron_job():
 
@@ -679,16 +1138,20 @@ def cron_job():
     global BASE_URL
     global HEADERS
 
+    last_archive_day = None
 
     while True:
         print(f'Update Started <-> {datetime.today()}',flush=True)
+
+        # Parse mappings once per cycle, each repo only intersects them with its contributors
+        user_aliases = get_user_aliases(mappings_collection.find({}))
         
         for repo in repo_collection.find({}):
             print(f"Updating -> {repo['repo_name']}",flush=True)
 
             repo_name = repo['repo_name']
             enterprise = repo['enterprise']
-            contributors = repo['contributors']
+            contributors = get_contributor_index(repo['contributors'], user_aliases)
             last_snapshot = repo['snapshot']
 
 
@@ -707,6 +1170,16 @@ def cron_job():
             update_repo_details(repo_name, contributors, last_snapshot, start_date)
         
         print('Update DONE',flush=True)
+
+        # Move activity past the horizon into cold storage once a day --> one blob per user / repo / day at most
+        # (best effort, never stops the updater)
+        if last_archive_day != datetime.today().date():
+            try:
+                archive_old_activity(get_archive_date())
+                last_archive_day = datetime.today().date()
+                print('Archive DONE',flush=True)
+            except Exception as e:
+                print(f"Archive FAILED: {e}",flush=True)
         sleep(3600)
 
 
@@ -0,0 +1,114 @@
+import base64
+from datetime import datetime
+
+import pytest
+
+from cron_job import (dedupe_activity, get_activity_date, encode_cursor, decode_cursor, get_item_key,
+                      get_user_aliases, get_contributor_index, get_commit_author, is_tracked_push)
+
+
+def test_dedupe_activity_later_copy_wins():
+    first = {'pr_number': 5, 'comments': []}
+    restored = {'pr_number': 5, 'comments': [{'comment': 'new'}]}
+    other = {'pr_number': 7, 'comments': []}
+
+    assert dedupe_activity('pull_requests', [first, other, restored]) == [restored, other]
+
+
+def test_dedupe_activity_drops_items_in_existing():
+    hot = [{'number': 1, 'state': 'closed'}]
+    cold = [{'number': 1, 'state': 'open'}, {'number': 2, 'state': 'closed'}]
+
+    assert dedupe_activity('issues', cold, hot) == [{'number': 2, 'state': 'closed'}]
+
+
+def test_dedupe_activity_keeps_empty_items():
+    assert dedupe_activity('issues', [None, {'number': 1}]) == [{'number': 1}, None]
+
+
+def test_get_activity_date_reads_nested_pr_commit_date():
+    pr = {
+        'pr_details': {'date': '2020-01-01T00:00:00Z'},
+        'commits': [{'sha': 'abc', 'commit': {'committer': {'date': '2024-06-01T10:00:00Z'}}}],
+        'comments': [{'date': '2023-01-01T00:00:00Z'}]
+    }
+
+    assert get_activity_date('pull_requests', pr) == datetime(2024, 6, 1, 10)
+
+
+def test_get_activity_date_uses_pr_merge_date():
+    pr = {
+        'pr_details': {'date': '2020-01-01T00:00:00Z', 'closed_at': '2024-05-01T00:00:00Z', 'merged_at': '2024-05-01T00:00:00Z'},
+        'commits': [],
+        'comments': []
+    }
+
+    assert get_activity_date('pull_requests', pr) == datetime(2024, 5, 1)
+
+
+def test_get_activity_date_ignores_unparseable_dates():
+    assert get_activity_date('issues', {'created_at': 'not a date', 'updated_at': '2024-01-02T03:04:05Z'}) == datetime(2024, 1, 2, 3, 4, 5)
+    assert get_activity_date('commits', {'date': None}) is None
+
+
+def make_item(date, sha):
+    return {'login': 'alice', 'repo_name': 'IBM/repo', 'type': 'commits', 'id': sha, 'date': date, 'data': {}}
+
+
+def test_cursor_round_trip():
+    item = make_item('2024-01-01T00:00:00Z', 'abc')
+
+    assert decode_cursor(encode_cursor(item)) == get_item_key(item)
+    assert decode_cursor(None) is None
+
+
+def test_cursor_is_stable_when_new_items_arrive():
+    items = [make_item('2024-01-03T00:00:00Z', 'c'), make_item('2024-01-02T00:00:00Z', 'b'), make_item('2024-01-01T00:00:00Z', 'a')]
+    cursor = decode_cursor(encode_cursor(items[0]))
+
+    items.insert(0, make_item('2024-01-04T00:00:00Z', 'd'))
+    remaining = [item for item in items if get_item_key(item) < cursor]
+
+    assert [item['id'] for item in remaining] == ['b', 'a']
+
+
+@pytest.mark.parametrize('cursor', ['not-base64!', base64.urlsafe_b64encode(b'{"offset": 5}').decode(), base64.urlsafe_b64encode(b'[1, 2, 3, 4, 5]').decode()])
+def test_decode_cursor_rejects_invalid(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_get_contributor_index_resolves_aliases_of_tracked_users_only(capsys):
+    user_aliases = get_user_aliases([
+        {'login': 'alice', 'aliases': ['alice@ibm.com', 'Alice A']},
+        {'login': 'bob', 'aliases': ['bob@ibm.com']},
+        {'_id': 3, 'user': 'carol'}
+    ])
+    index = get_contributor_index(['alice', 'dave'], user_aliases)
+
+    assert index == {'alice': 'alice', 'dave': 'dave', 'alice@ibm.com': 'alice', 'Alice A': 'alice'}
+    assert 'Skipping user mapping 3' in capsys.readouterr().out
+
+
+def test_push_gate_and_attribution_use_the_same_identities():
+    contributors = get_contributor_index(['alice'], {'alice': ['alice@ibm.com']})
+    event = {
+        'actor': {'login': 'ci-bot'},
+        'payload': {'commits': [{'sha': 'abc', 'author': {'name': 'A', 'email': 'alice@ibm.com'}}]}
+    }
+    pr_commit = {'sha': 'abc', 'author': None, 'committer': None, 'commit': {'author': {'name': 'A', 'email': 'alice@ibm.com'}}}
+
+    assert is_tracked_push(event, contributors)
+    assert get_commit_author(pr_commit, contributors) == 'alice'
+
+
+def test_untracked_push_is_rejected():
+    contributors = get_contributor_index(['alice'], {})
+    event = {
+        'actor': {'login': 'mallory'},
+        'payload': {'commits': [{'sha': 'abc', 'author': {'name': 'Mallory', 'email': 'm@example.com'}}]}
+    }
+    pr_commit = {'sha': 'abc', 'author': {'login': 'mallory'}, 'committer': None, 'commit': {'author': {'name': 'Mallory', 'email': 'm@example.com'}}}
+
+    assert not is_tracked_push(event, contributors)
+    assert get_commit_author(pr_commit, contributors) is None